@@ -0,0 +1,116 @@
+# cython: language_level=3
+"""
+optional C accelerator for the hot path of every.py
+Build in place with: cythonize -i _every_fast.pyx (POSIX only)
+every.py falls back to its pure Python implementation if this extension is not built.
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+import sys
+from time import monotonic_ns as _monotonic_ns
+from libc.math cimport INFINITY
+
+cdef extern from "<time.h>" nogil:
+    ctypedef int clockid_t
+    ctypedef long time_t
+    struct timespec:
+        time_t tv_sec
+        long tv_nsec
+    enum: CLOCK_MONOTONIC
+    int clock_gettime(clockid_t clk_id, timespec *tp)
+
+cdef extern from *:
+    """
+    #ifndef CLOCK_MONOTONIC_COARSE
+    #define CLOCK_MONOTONIC_COARSE CLOCK_MONOTONIC
+    #endif
+    """
+    enum: CLOCK_MONOTONIC_COARSE
+
+cdef long long _NOT_STARTED = -(1LL << 62) # same as every._NOT_STARTED
+cdef long long _NEVER_NS = 1LL << 62 # same as every._NEVER_NS
+
+# time.monotonic_ns() reads CLOCK_MONOTONIC on Linux, so it can be read directly there
+cdef bint _direct_monotonic = sys.platform.startswith("linux")
+
+
+cdef inline long long _clock_ns(clockid_t clock) noexcept nogil:
+    cdef timespec ts
+    clock_gettime(clock, &ts)
+    return <long long>ts.tv_sec * 1000000000LL + ts.tv_nsec
+
+
+def coarse_monotonic_ns():
+    """Get the time of the last kernel tick of CLOCK_MONOTONIC_COARSE in nanoseconds (Linux only)."""
+    return _clock_ns(CLOCK_MONOTONIC_COARSE)
+
+
+cdef class EveryCore:
+    """The hot path of Every: checking the time and executing a due function."""
+
+    cdef public long long _interval_ns
+    cdef public long long _next_time_ns
+    cdef public object _time_func_ns
+    cdef public object _action
+    cdef public object _kwargs
+    cdef public object _result
+    cdef public bint _paused
+    cdef public bint _keep_interval
+    cdef public bint _execute_immediately
+
+
+    cdef inline long long _now(self) except? -1:
+        cdef object time_func = self._time_func_ns
+        if time_func is coarse_monotonic_ns:
+            return _clock_ns(CLOCK_MONOTONIC_COARSE)
+        if _direct_monotonic and time_func is _monotonic_ns:
+            return _clock_ns(CLOCK_MONOTONIC)
+        return time_func()
+
+
+    cdef _fire_c(self, tuple args, dict kwargs):
+        cdef long long interval = self._interval_ns
+        self._next_time_ns += interval # adding interval to keep correct time interval
+        self._result = self._action(*args, **(self._kwargs | kwargs if kwargs else self._kwargs))
+        if not self._keep_interval:
+            self._next_time_ns = self._now() + interval
+
+
+    def __call__(self, *args, **kwargs):
+        """Checks if the scheduled interval has passed and executes the stored function if so.
+        Returns True if the function was executed, False otherwise."""
+        if self._paused:
+            return False
+
+        cdef long long now = self._now()
+        if now < self._next_time_ns:
+            return False
+
+        if self._next_time_ns == _NOT_STARTED:
+            if not self._execute_immediately:
+                self._next_time_ns = now + self._interval_ns
+                return False
+            self._next_time_ns = now
+
+        self._fire_c(args, kwargs)
+        return True
+
+
+    def _fire(self, *args, **kwargs):
+        """Execute the stored function of a due timer and schedule the next execution.
+        Used by schedulers that already checked the time themselves."""
+        self._fire_c(args, kwargs)
+
+
+    @property
+    def time_remaining(self):
+        """Get the time remaining until next execution."""
+        if self._next_time_ns == _NOT_STARTED and self._execute_immediately:
+            return 0.0
+        if self._interval_ns >= _NEVER_NS:
+            return INFINITY # an interval of math.inf
+        if self._next_time_ns == _NOT_STARTED:
+            return self._interval_ns / 1e9
+        cdef long long remaining = self._next_time_ns - self._now()
+        return remaining / 1e9 if remaining > 0 else 0.0
@@ -4,12 +4,150 @@ Author: AlexL
 License: MIT
 Github: https://github.com/Hangover3832/every
 """
-from time import monotonic
-from typing import Callable, Any, NoReturn, Optional, Union
-from functools import wraps
+from time import sleep, monotonic, monotonic_ns, perf_counter, perf_counter_ns, time, time_ns, process_time, process_time_ns, thread_time, thread_time_ns
+from typing import Callable, Any, Mapping, NoReturn, Optional, Union
+from types import MappingProxyType
+from functools import partial
+from math import inf
+import sys
+
+
+_NS_PER_SECOND: int = 1_000_000_000
+_LINUX: bool = sys.platform.startswith("linux")
+_NOT_STARTED: int = -(1 << 62) # next time of a timer before its first call, earlier than any clock value
+_NEVER_NS: int = 1 << 62 # the interval of math.inf, a clock value plus this still fits into 64 bits
+
+# Coarse monotonic clock: the time of the last kernel tick (resolution ~1-4ms) which is cheaper to read.
+# Suitable for intervals well above the tick, do not use it for intervals below ~1ms. Linux only, else monotonic.
+if _LINUX:
+    from time import clock_gettime, clock_gettime_ns
+    _CLOCK_MONOTONIC_COARSE: int = 6 # not exported by the time module
+    coarse_monotonic: Callable[[], float] = partial(clock_gettime, _CLOCK_MONOTONIC_COARSE)
+    coarse_monotonic_ns: Callable[[], int] = partial(clock_gettime_ns, _CLOCK_MONOTONIC_COARSE)
+else:
+    coarse_monotonic = monotonic
+    coarse_monotonic_ns = monotonic_ns
+
+# integer nanosecond variants of the known float clocks, they avoid the float conversion and float arithmetic
+_NS_CLOCKS: dict[Callable[[], float], Callable[[], int]] = {
+    monotonic: monotonic_ns,
+    perf_counter: perf_counter_ns,
+    time: time_ns,
+    process_time: process_time_ns,
+    thread_time: thread_time_ns,
+    coarse_monotonic: coarse_monotonic_ns,
+}
+
+
+def _to_ns(time_func: Callable[[], float]) -> Callable[[], int]:
+    """Return a time function in integer nanoseconds for the given time function in seconds."""
+    ns_func = _NS_CLOCKS.get(time_func)
+    if ns_func is None:
+        # custom time function, convert its result on each call (loses precision for large values, prefer using_ns())
+        def ns_func() -> int:
+            return int(time_func() * _NS_PER_SECOND)
+    return ns_func
+
+
+def _from_ns(time_func_ns: Callable[[], int]) -> Callable[[], float]:
+    """Return a time function in seconds for the given time function in integer nanoseconds."""
+    for time_func, ns_func in _NS_CLOCKS.items():
+        if ns_func is time_func_ns:
+            return time_func
+
+    def time_func() -> float:
+        return time_func_ns() / _NS_PER_SECOND
+    return time_func
+
+
+def _seconds_to_ns(seconds: float) -> int:
+    if seconds != seconds:
+        raise ValueError("Error: Time value must be a number, not NaN.")
+    if abs(seconds) >= _NEVER_NS / _NS_PER_SECOND:
+        return _NEVER_NS if seconds > 0 else -_NEVER_NS # math.inf and other values beyond ~146 years
+    return round(seconds * _NS_PER_SECOND)
+
+
+def _dummy_action(*args, **kwargs) -> NoReturn:
+    """The action until do() is used, a plain function instead of a bound method so it holds no reference to the instance."""
+    raise ValueError("No action has been set. Use the 'do' method to set a function to execute.")
+
+
+class _EveryCore:
+    """The hot path of Every: checking the time and executing a due function.
+    Replaced by the compiled _every_fast.EveryCore if that optional extension has been built."""
+
+    # no per instance __dict__, the attributes are fixed slots
+    __slots__ = ("_interval_ns", "_next_time_ns", "_time_func_ns", "_action", "_kwargs", "_result", "_paused", "_keep_interval", "_execute_immediately")
 
+    def __call__(self, *args, **kwargs: Any) -> bool:
+        """
+        Checks if the scheduled interval has passed and executes the stored function if so.
+
+        Args:
+            **kwargs: Additional keyword arguments to pass to the stored function.
+
+        Returns:
+            tuple[bool, Any]: A tuple containing:
+                - bool: True if the function was executed, False otherwise.
+                - Any: The return value from the function if executed, or None otherwise.
+        """        
+        if self._paused: # kept as a flag, switching __class__ on pause() breaks pickling and subclasses
+            return False
+
+        # a single clock read and attribute load for the common 'not yet due' case
+        now = self._time_func_ns()
+        if now < self._next_time_ns:
+            return False
 
-class Every:
+        if self._next_time_ns == _NOT_STARTED:
+            # the timer starts with its first call instead of its creation, saves a clock read at import time
+            if not self._execute_immediately:
+                self._next_time_ns = now + self._interval_ns
+                return False
+            self._next_time_ns = now
+
+        self._fire(*args, **kwargs)
+        return True
+
+
+    def _fire(self, *args, **kwargs: Any) -> None:
+        """Execute the stored function of a due timer and schedule the next execution.
+        Used by __call__ and by schedulers that already checked the time themselves."""
+        interval = self._interval_ns
+        self._next_time_ns += interval # adding interval to keep correct time interval
+        # the stored kwargs are unpacked into a fresh dict by the call anyway, merge (C level dict union) only if overridden
+        self._result = self._action(*args, **(self._kwargs | kwargs if kwargs else self._kwargs)) # execute the function
+        if not self._keep_interval:
+            # If not keeping interval, reset next time to current time plus interval,
+            # the clock has to be read again since the function took some time
+            self._next_time_ns = self._time_func_ns() + interval
+
+
+    @property
+    def time_remaining(self) -> float:
+        """Get the time remaining until next execution."""
+        if self._next_time_ns == _NOT_STARTED and self._execute_immediately:
+            return 0.0
+        if self._interval_ns >= _NEVER_NS:
+            return inf # an interval of math.inf
+        if self._next_time_ns == _NOT_STARTED:
+            return self._interval_ns / _NS_PER_SECOND
+        remaining = self._next_time_ns - self._time_func_ns()
+        return remaining / _NS_PER_SECOND if remaining > 0 else 0.0
+
+
+try:
+    from _every_fast import EveryCore as _EveryCore # optional C accelerator, see _every_fast.pyx
+    if _LINUX:
+        # the accelerator reads the coarse clock directly, without the Python call overhead
+        from _every_fast import coarse_monotonic_ns
+        _NS_CLOCKS[coarse_monotonic] = coarse_monotonic_ns
+except ImportError:
+    pass
+
+
+class Every(_EveryCore):
     """A simple class for executing a function at regular intervals.
     The Every class provides a mechanism to control periodic execution of a function,
     allowing for flexible timing control and parameter passing.
@@ -25,6 +163,7 @@ class Every:
         do(action: Callable) -> 'Every': Sets the function to be executed 
         among(**kwargs) -> 'Every': Sets the keyword arguments for the funtion.
         using(time_func: Callable) -> 'Every': Sets a custom time function (default is monotonic).
+        using_ns(time_func_ns: Callable) -> 'Every': Sets a custom time function in integer nanoseconds (default is monotonic_ns).
         Note: When calling the instance, any keyword arguments passed will override those set in among().
     Returns:
         tuple[bool, Any]: A tuple containing:
@@ -34,6 +173,8 @@ class Every:
         icluded in Demo() function below
     """
 
+    __slots__ = ("_time_func", "_is_decorator", "__name__", "__weakref__")
+
     @classmethod # decorator for class Every
     def every(cls,
             interval: float, 
@@ -50,7 +191,6 @@ class Every:
             keep_interval (bool): Keep correct time interval if set to True, else keep temporal distance after function call
             **kwargs: Additional keyword arguments to pass to the function.
         """
-        @wraps(wrapped=cls)
         def wrapper(func: Callable[[], float]) -> 'Every':
             inst = cls(
                     interval, 
@@ -61,6 +201,7 @@ class Every:
                     ).using(timer_function
             )
             inst._is_decorator = True
+            inst._wrap(func)
             return inst
 
         return wrapper
@@ -70,13 +211,20 @@ class Every:
             interval: float,
             *,
             timer_function: Callable[[], float] = monotonic,
+            min_sleep: float = 0.0,
             **kwargs: Optional[Any]
             ) -> Callable[[Callable], 'Every']:
-        """**Note that you cannot acces the instance within the loop until it is finished**"""
+        """**Note that you cannot acces the instance within the loop until it is finished**
+        Args:
+            interval (float): The duration of the loop in seconds.
+            min_sleep (float): Sleep this long between the function calls (default 0, no sleep)
+            **kwargs: Additional keyword arguments to pass to the function.
+        """
 
-        @wraps(wrapped=cls)
         def wrapper(func: Callable[[], float]) -> 'Every':
-            return cls(interval).do(func).among(**kwargs).using(timer_function).do_while()
+            inst = cls(interval).do(func).among(**kwargs).using(timer_function)
+            inst._wrap(func)
+            return inst.do_while(min_sleep=min_sleep)
 
         return wrapper
 
@@ -85,32 +233,54 @@ class Every:
         if interval < 0:
             raise ValueError("Error: Interval must be positive.")
 
-        self._interval: float = interval
+        # the timing is kept in integer nanoseconds
+        self._interval_ns: int = _seconds_to_ns(interval)
         self._keep_interval: bool = keep_interval
         self._time_func: Callable[[], float] = monotonic
-        self._action: Callable = self._dummy_action
+        self._time_func_ns: Callable[[], int] = monotonic_ns
+        self._action: Callable = _dummy_action
         self._kwargs = {}
         self._paused: bool = False
-        self._next_time: float = self._time_func() if execute_immediately else self._time_func() + interval
+        self._execute_immediately: bool = execute_immediately
+        self._next_time_ns: int = _NOT_STARTED # started lazily by the first call, see _start()
         self._is_decorator: bool = False
         self._result = None
-        self.instance = self
 
 
-    def _dummy_action(self, *args, **kwargs) -> NoReturn:
-        raise ValueError("No action has been set. Use the 'do' method to set a function to execute.")
+    def _start(self) -> 'Every':
+        """Start the timer now if it has not been started by a call yet, used by schedulers."""
+        if self._next_time_ns == _NOT_STARTED:
+            now = self._time_func_ns()
+            self._next_time_ns = now if self._execute_immediately else now + self._interval_ns
+        return self
+
+
+    def _wrap(self, func: Callable) -> None:
+        """Keep the name of a decorated function, cheaper than functools.wraps"""
+        self.__name__ = getattr(func, "__name__", repr(func))
 
 
-    def do_while(self, *args, **kwargs) -> 'Every':
+    def do_while(self, *args, min_sleep: float = 0.0, **kwargs) -> 'Every':
         """Do the action in a loop as long as the given interval.
+        With min_sleep > 0 the loop sleeps that long between the calls instead of spinning,
+        the last sleep is cut short at the end of the interval.
         Usage: Every(timeout).do(my_function).among(param1=1, param2=2).do_while()"""
-
-        result = None
-        self.instance = self
-        merged_kwargs = {**self._kwargs, **kwargs}
-        t = monotonic() + self._interval
-        while monotonic() < t:
-            self._result = self._action(*args, **merged_kwargs)
+        if min_sleep < 0:
+            raise ValueError("Error: Minimum sleep must be positive.")
+
+        merged_kwargs = self._kwargs | kwargs if kwargs else self._kwargs
+        action = self._action
+        time_func = self._time_func_ns
+        min_sleep_ns = _seconds_to_ns(min_sleep)
+        deadline = time_func() + self._interval_ns # absolute deadline, computed once
+        remaining = self._interval_ns
+        while remaining > 0:
+            self._result = action(*args, **merged_kwargs)
+            remaining = deadline - time_func() # the only clock read per loop
+            if min_sleep_ns and remaining > 0:
+                pause = min(min_sleep_ns, remaining)
+                sleep(pause / _NS_PER_SECOND)
+                remaining -= pause # estimated, the next loop reads the clock again
         return self
 
 
@@ -121,19 +291,35 @@ class Every:
 
 
     def among(self, **kwargs: Optional[Any]) -> 'Every':
-        self._kwargs = kwargs
+        """Sets the keyword arguments for the function, replacing the previous ones.
+        Called again with the same keywords, the stored dict is updated in place."""
+        stored = self._kwargs
+        if stored.keys() == kwargs.keys():
+            stored.update(kwargs)
+        else:
+            self._kwargs = {sys.intern(key): value for key, value in kwargs.items()}
         return self
 
 
-    def using(self, time_func: Callable) -> 'Every':
-        """Sets a custom time function (default is monotonic)."""
+    def using(self, time_func: Callable[[], float]) -> 'Every':
+        """Sets a custom time function in seconds (default is monotonic).
+        Known clocks like perf_counter are replaced by their nanosecond variant, others are converted on each call."""
         self._time_func = time_func
+        self._time_func_ns = _to_ns(time_func)
+        return self
+
+
+    def using_ns(self, time_func_ns: Callable[[], int]) -> 'Every':
+        """Sets a custom time function in integer nanoseconds (default is monotonic_ns).
+        Preferred for custom clocks, it is used as is and keeps full precision."""
+        self._time_func_ns = time_func_ns
+        self._time_func = _from_ns(time_func_ns)
         return self
 
 
     def reset(self) -> 'Every':
         """Reset the timer to start from current moment."""
-        self._next_time = self._time_func() + self._interval
+        self._next_time_ns = self._time_func_ns() + self._interval_ns
         return self
 
 
@@ -149,71 +335,57 @@ class Every:
         return self
 
 
-    def __call__(self, *args, **kwargs: Any) -> bool:
-        """
-        Checks if the scheduled interval has passed and executes the stored function if so.
-
-        Args:
-            **kwargs: Additional keyword arguments to pass to the stored function.
-
-        Returns:
-            tuple[bool, Any]: A tuple containing:
-                - bool: True if the function was executed, False otherwise.
-                - Any: The return value from the function if executed, or None otherwise.
-        """        
-        if self._paused:
-            return False
-        
-        if self._time_func() >= self._next_time:
-            self._next_time += self._interval # adding interval to keep correct time interval
-            merged_kwargs = {**self._kwargs, **kwargs}
-            self._result = self._action(*args, **merged_kwargs) # execute the function
-            if not self._keep_interval:
-                # If not keeping interval, reset next time to current time plus interval
-                self._next_time = self._time_func() + self._interval
-            return True
-
-        return False
-
-
     def __repr__(self) -> str:
         """Return a string representation of the object."""
-        return f"Every(action={self._action}, interval={self._interval}, next_time={self._next_time}, is_decorator={self.is_decorator})"
+        return f"Every(action={self._action}, interval={self.interval}, next_time={self.next_time}, is_decorator={self.is_decorator})"
 
     def execute(self, *args: Optional[Any], **kwargs: Optional[Any]) -> Optional[Any]:
         """Execute the function immediately"""
-        merged_kwargs = {**self._kwargs, **kwargs}
-        self._result = self._action(*args, **merged_kwargs)
-        return self._result
+        result = self._action(*args, **(self._kwargs | kwargs if kwargs else self._kwargs))
+        self._result = result
+        return result
 
 
     @property
     def interval(self) -> float:
         """The time interval between executions (readable/writable)"""
-        return self._interval
+        if self._interval_ns >= _NEVER_NS:
+            return inf
+        return self._interval_ns / _NS_PER_SECOND
 
     @interval.setter
     def interval(self, value: float) -> None:
         """
         Sets a new interval value and resets the next execution time.
+        Both are written directly, so to the caller the change happens at once.
 
         Args:
             value (float): The new time interval in seconds.
         """
         if value < 0:
             raise ValueError("Interval must be positive")
-        self._interval = value
-        self.reset()
+        interval_ns = _seconds_to_ns(value)
+        self._interval_ns = interval_ns
+        self._next_time_ns = self._time_func_ns() + interval_ns # same as reset(), without the method call
  
+    def remaining_from(self, now: float) -> float:
+        """Get the time remaining until next execution from an already known time of the time function,
+        e.g. to query many timers with a single clock read."""
+        if self._next_time_ns == _NOT_STARTED and self._execute_immediately:
+            return 0.0
+        if self._interval_ns >= _NEVER_NS:
+            return inf # an interval of math.inf
+        if self._next_time_ns == _NOT_STARTED:
+            return self._interval_ns / _NS_PER_SECOND
+        remaining = self._next_time_ns / _NS_PER_SECOND - now
+        return remaining if remaining > 0.0 else 0.0
+
     @property
-    def time_remaining(self) -> float:
-        """Get the time remaining until next execution."""
-        return max(0.0, self._next_time - self._time_func())
-        
-    @property
-    def next_time(self) -> float:
-        """Get the next execution time."""
-        return self._next_time
+    def next_time(self) -> Optional[float]:
+        """Get the next execution time, None if the timer has not been started by a call or reset() yet."""
+        if self._next_time_ns == _NOT_STARTED:
+            return None
+        return self._next_time_ns / _NS_PER_SECOND
 
     @property
     def paused(self)  -> bool:
@@ -224,15 +396,25 @@ class Every:
     def time_func(self) -> Callable[[], float]:
         """Get the current time function."""
         return self._time_func
+
+    @property
+    def time_func_ns(self) -> Callable[[], int]:
+        """Get the current time function in integer nanoseconds, used for the timing."""
+        return self._time_func_ns
     
+    @property
+    def instance(self) -> 'Every':
+        """Get the instance itself, a property instead of an attribute to avoid a reference cycle"""
+        return self
+
     @property
     def is_decorator(self) -> bool:
         return self._is_decorator
 
     @property
-    def kwargs(self) -> dict:
-        """Get the stored keyword arguments"""
-        return self._kwargs
+    def kwargs(self) -> Mapping[str, Any]:
+        """Get the stored keyword arguments (read only view)"""
+        return MappingProxyType(self._kwargs)
 
     @property
     def result(self) -> Any:
@@ -0,0 +1,103 @@
+"""
+executing a function at regular intervals within an asyncio event loop
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+import asyncio
+from inspect import isawaitable
+from typing import Any, Optional
+from every import Every, _NS_PER_SECOND
+
+_PAUSED_POLL_NS: int = 10_000_000 # check a paused timer at least every 10ms
+
+
+class AsyncEvery(Every):
+    """An Every instance that runs as an asyncio task.
+    Instead of being called from a polling loop, the task sleeps until the next execution time
+    and lets the event loop wake it up, together with all other pending I/O.
+    The function may be a coroutine function, its result is awaited before the next execution.
+    Methods:
+        run(*args, **kwargs) -> None: Coroutine executing the function on schedule until cancelled.
+        start(*args, **kwargs) -> asyncio.Task: Start run() as a task of the running event loop.
+    Example:
+        ticker = AsyncEvery(1.0).do(print).among(end="\\n")
+        task = ticker.start("tick")
+        ...
+        task.cancel()
+    """
+
+    __slots__ = ("_wakeup",)
+
+    def __init__(self, *args, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._wakeup: Optional[asyncio.Event] = None # set by run()
+
+
+    def _wake(self) -> None:
+        """Wake up a sleeping run() task to pick up a changed schedule."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+    def reset(self) -> 'AsyncEvery':
+        """Reset the timer to start from current moment."""
+        super().reset()
+        self._wake()
+        return self
+
+
+    def resume(self) -> 'AsyncEvery':
+        """Continue execution"""
+        super().resume()
+        self._wake()
+        return self
+
+
+    @Every.interval.setter
+    def interval(self, value: float) -> None:
+        """Sets a new interval value and resets the next execution time, a sleeping run() task is woken up."""
+        Every.interval.fset(self, value)
+        self._wake()
+
+
+    async def run(self, *args, **kwargs: Any) -> None:
+        """Execute the function on schedule until the task is cancelled.
+        Arguments are passed on every execution, like when calling the instance.
+        Changing interval or calling reset() or resume() wakes the sleeping task up,
+        they have to be called from the thread of the event loop."""
+        self._start()
+        wakeup = self._wakeup = asyncio.Event()
+        sleep_ns = 0
+        while True:
+            if sleep_ns > 0:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), sleep_ns / _NS_PER_SECOND)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0) # always yield to the event loop
+            wakeup.clear()
+
+            if self._paused:
+                sleep_ns = min(self._interval_ns, _PAUSED_POLL_NS) or _PAUSED_POLL_NS
+                continue
+
+            sleep_ns = self._next_time_ns - self._time_func_ns()
+            if sleep_ns > 0:
+                continue # woken up early
+
+            self._fire(*args, **kwargs)
+            if isawaitable(self._result):
+                self._result = await self._result
+                if not self._keep_interval:
+                    self._next_time_ns = self._time_func_ns() + self._interval_ns # the interval starts after the coroutine
+            sleep_ns = self._next_time_ns - self._time_func_ns()
+
+
+    def start(self, *args, **kwargs: Any) -> 'asyncio.Task':
+        """Start run() as a task of the running event loop.
+        Returns:
+            asyncio.Task: The task, cancel it to stop the timer.
+        """
+        return asyncio.get_running_loop().create_task(self.run(*args, **kwargs))
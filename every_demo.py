@@ -1,4 +1,5 @@
 from every import Every
+from every_scheduler import TimingWheel
 from time import sleep, perf_counter, monotonic
 from random import random
 
@@ -64,5 +65,22 @@ def Demo():
     # result = timed_while.do_while().result
 
 
+def SchedulerDemo():
+
+    # many timers driven by a single clock read per tick:
+    def report(name: str) -> None:
+        print(f"{name} executed at {monotonic():.2f}s")
+
+    wheel = TimingWheel(resolution=0.01)
+    for interval in (0.5, 1.0, 2.71, 3.14, 5.0):
+        wheel.add(Every(interval).do(report).among(name=f"Timer {interval}s"))
+
+    wheel.add(Every(30).do(report).among(name="Never reached")) # kept in the second wheel level
+    print(wheel)
+
+    wheel.run_until(monotonic() + 10) # tick the wheel for 10s
+
+
 if __name__ == "__main__":
     Demo() # This will run the demo code
+    SchedulerDemo()
@@ -0,0 +1,113 @@
+"""
+vectorized pool of Every instances, requires numpy
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+from time import monotonic
+from typing import Callable, Optional
+import numpy as np
+from every import Every, _to_ns
+
+
+class TimerPool:
+    """A pool of many Every instances with their next execution times in a numpy array.
+    A single tick() reads the clock once and finds the due timers with one vectorized comparison,
+    only the due timers are touched in Python.
+    Args:
+        capacity (int): The initial number of timers, the pool grows as needed.
+        time_func (Callable): The clock shared by all timers of the pool (default is monotonic).
+        time_func_ns (Callable): The same clock in integer nanoseconds, used instead of time_func if given.
+    Methods:
+        add(*timers: Every) -> 'TimerPool': Add one or more Every instances.
+        remove(timer: Every) -> 'TimerPool': Remove an Every instance from the pool.
+        tick() -> int: Execute all due timers, returns the number of executed timers.
+    Note:
+        Each timer is executed at most once per tick.
+        An exception raised by a function is propagated by tick(), the remaining due timers
+        are executed with the next tick().
+        The timers must use the same time function as the pool. If you change the interval
+        of a timer outside of its own function, add() it again to update its next execution time.
+    """
+
+    def __init__(self, capacity: int = 64, *, time_func: Callable[[], float] = monotonic,
+                 time_func_ns: Optional[Callable[[], int]] = None) -> None:
+        if capacity < 1:
+            raise ValueError("Error: Capacity must be positive.")
+
+        self._time_func_ns: Callable[[], int] = time_func_ns or _to_ns(time_func)
+        self._next_time_ns: np.ndarray = np.empty(capacity, np.int64)
+        self._timers: list[Every] = []
+        self._index: dict[Every, int] = {} # position of each timer in _timers and _next_time_ns
+
+
+    def add(self, *timers: Every) -> 'TimerPool':
+        """Add one or more Every instances, timers already in the pool get their next execution time updated."""
+        for timer in timers:
+            index = self._index.get(timer)
+            if index is None:
+                index = len(self._timers)
+                if index == len(self._next_time_ns):
+                    grown = np.empty(2 * index, np.int64)
+                    grown[:index] = self._next_time_ns
+                    self._next_time_ns = grown
+                self._timers.append(timer)
+                self._index[timer] = index
+            self._next_time_ns[index] = timer._start()._next_time_ns
+        return self
+
+
+    def remove(self, timer: Every) -> 'TimerPool':
+        """Remove an Every instance from the pool, unknown timers are ignored."""
+        index = self._index.pop(timer, None)
+        if index is None:
+            return self
+
+        last = self._timers.pop()
+        if last is not timer:
+            # move the last timer into the gap
+            self._timers[index] = last
+            self._index[last] = index
+            self._next_time_ns[index] = self._next_time_ns[len(self._timers)]
+        return self
+
+
+    def tick(self) -> int:
+        """Execute all due timers with a single read of the clock.
+        Returns:
+            int: The number of executed timers.
+        """
+        now = self._time_func_ns()
+        due = np.flatnonzero(self._next_time_ns[:len(self._timers)] <= now)
+        if not len(due):
+            return 0
+
+        timers = self._timers
+        due_timers = [timers[i] for i in due.tolist()] # positions may change if a function adds or removes timers
+        index = self._index
+        fired = 0
+        for timer in due_timers:
+            if timer._paused or timer not in index:
+                continue
+            if timer._next_time_ns > now:
+                # its next time was changed by an executed function, e.g. with reset()
+                self._next_time_ns[index[timer]] = timer._next_time_ns
+                continue
+            try:
+                timer._fire()
+                fired += 1
+            finally:
+                position = index.get(timer) # also if it raised, so it is not executed again before it is due
+                if position is not None:
+                    self._next_time_ns[position] = timer._next_time_ns
+
+        return fired
+
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+
+    def __repr__(self) -> str:
+        """Return a string representation of the object."""
+        return f"TimerPool(timers={len(self)}, capacity={len(self._next_time_ns)})"
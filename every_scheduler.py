@@ -0,0 +1,559 @@
+"""
+schedulers for driving many Every instances from a single clock read
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+import os
+import ctypes
+import ctypes.util
+import selectors
+import sys
+import threading
+from collections import deque
+from heapq import heapify, heappush, heappop
+from itertools import count
+from time import monotonic, sleep
+from typing import Callable, Optional
+from every import Every, _to_ns, _seconds_to_ns, _NS_PER_SECOND, _LINUX
+
+_CLOCK_MONOTONIC: int = 1 # Linux values, the same clock as time.monotonic()
+_TFD_TIMER_ABSTIME: int = 1
+_MIN_DELAY_NS: int = 1_000_000 # an overdue EveryGroup timer is executed again at the earliest 1ms later
+_PAUSED_POLL_NS: int = 10_000_000 # check a paused EveryGroup timer every 10ms
+
+
+if hasattr(os, "timerfd_create"): # Python 3.13+
+    def _timerfd_create() -> int:
+        return os.timerfd_create(_CLOCK_MONOTONIC, flags=os.TFD_NONBLOCK | os.TFD_CLOEXEC)
+
+    def _timerfd_settime_ns(fd: int, deadline_ns: int) -> None:
+        os.timerfd_settime_ns(fd, flags=os.TFD_TIMER_ABSTIME, initial=deadline_ns)
+
+else:
+    class _timespec(ctypes.Structure):
+        _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+    class _itimerspec(ctypes.Structure):
+        _fields_ = [("it_interval", _timespec), ("it_value", _timespec)]
+
+    _libc: Optional[ctypes.CDLL] = None
+
+    def _libc_call(name: str, *args) -> int:
+        global _libc
+        if _libc is None:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        result = getattr(_libc, name)(*args)
+        if result < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return result
+
+    def _timerfd_create() -> int:
+        return _libc_call("timerfd_create", _CLOCK_MONOTONIC, os.O_NONBLOCK | os.O_CLOEXEC)
+
+    def _timerfd_settime_ns(fd: int, deadline_ns: int) -> None:
+        spec = _itimerspec(it_value=_timespec(*divmod(deadline_ns, _NS_PER_SECOND)))
+        _libc_call("timerfd_settime", fd, _TFD_TIMER_ABSTIME, ctypes.byref(spec), None)
+
+
+class TimingWheel:
+    """A two level hashed timing wheel for many Every instances.
+    Instead of calling every timer in the main loop, the timers are added to the wheel
+    and a single tick() reads the clock once and executes only the timers that are due.
+    Timers further away than one wheel revolution are kept in a second, coarser wheel
+    and cascaded into the first one when their time comes (Varghese & Lauck).
+    Args:
+        resolution (float): The duration of one wheel slot in seconds.
+        wheel_size (int): The number of slots per wheel level, must be a power of two.
+        time_func (Callable): The clock shared by all scheduled timers (default is monotonic).
+        time_func_ns (Callable): The same clock in integer nanoseconds, used instead of time_func if given.
+    Methods:
+        add(*timers: Every) -> 'TimingWheel': Schedule one or more Every instances.
+        remove(timer: Every) -> 'TimingWheel': Remove a scheduled Every instance.
+        tick() -> int: Execute all due timers, returns the number of executed timers.
+        run_until(deadline: float) -> 'TimingWheel': Tick the wheel until deadline is reached.
+    Note:
+        Timers are executed at most one resolution late, never early.
+        An exception raised by a function is propagated by tick(), the timer stays scheduled
+        and the remaining due timers are executed with the next tick().
+        The scheduled timers must use the same time function as the wheel. If you change the interval
+        of a scheduled timer outside of its own function, add() it again to move it to its new slot.
+    """
+
+    def __init__(self, resolution: float = 0.01, wheel_size: int = 256, *, time_func: Callable[[], float] = monotonic,
+                 time_func_ns: Optional[Callable[[], int]] = None) -> None:
+        if resolution <= 0:
+            raise ValueError("Error: Resolution must be positive.")
+        if wheel_size < 2 or wheel_size & (wheel_size - 1):
+            raise ValueError("Error: Wheel size must be a power of two.")
+
+        self._resolution_ns: int = _seconds_to_ns(resolution)
+        self._wheel_size: int = wheel_size
+        self._mask: int = wheel_size - 1
+        self._bits: int = wheel_size.bit_length() - 1
+        self._time_func_ns: Callable[[], int] = time_func_ns or _to_ns(time_func)
+        self._wheel: list[deque] = [deque() for _ in range(wheel_size)]
+        self._overflow: list[deque] = [deque() for _ in range(wheel_size)]
+        self._slots: dict[Every, Optional[deque]] = {} # the bucket each timer is stored in, None while executing
+        self._current_tick: int = self._time_func_ns() // self._resolution_ns # first tick not processed yet
+
+
+    def _insert(self, timer: Every) -> None:
+        due = timer._next_time_ns // self._resolution_ns
+        if due < self._current_tick:
+            due = self._current_tick # overdue timers are executed with the next processed tick
+        if due - self._current_tick < self._wheel_size:
+            bucket = self._wheel[due & self._mask]
+        else:
+            bucket = self._overflow[(due >> self._bits) & self._mask]
+        bucket.append(timer)
+        self._slots[timer] = bucket
+
+
+    def add(self, *timers: Every) -> 'TimingWheel':
+        """Schedule one or more Every instances, already scheduled timers are moved to their current slot."""
+        for timer in timers:
+            self.remove(timer)
+            self._insert(timer._start())
+        return self
+
+
+    def remove(self, timer: Every) -> 'TimingWheel':
+        """Remove a scheduled Every instance, unknown timers are ignored."""
+        bucket = self._slots.pop(timer, None)
+        if bucket is not None:
+            bucket.remove(timer)
+        return self
+
+
+    def _cascade(self, tick: int) -> None:
+        """Move the timers of the matching second level slot into the first level."""
+        bucket = self._overflow[(tick >> self._bits) & self._mask]
+        for _ in range(len(bucket)):
+            self._insert(bucket.popleft())
+
+
+    def _drain(self, bucket: deque, now: int) -> int:
+        fired = 0
+        for _ in range(len(bucket)): # timers appended while draining belong to the next revolution
+            if not bucket:
+                break # the remaining timers were removed by an executed function
+            timer = bucket.popleft()
+            if timer._paused or timer._next_time_ns > now:
+                self._insert(timer)
+                continue
+
+            self._slots[timer] = None
+            try:
+                timer._fire()
+            finally:
+                if timer in self._slots and self._slots[timer] is None:
+                    # not removed or added again by its own function, also if it raised
+                    self._insert(timer)
+            fired += 1
+
+        return fired
+
+
+    def tick(self) -> int:
+        """Execute all due timers with a single read of the clock.
+        Returns:
+            int: The number of executed timers.
+        """
+        now = self._time_func_ns()
+        target = now // self._resolution_ns
+        fired = 0
+        while self._current_tick <= target:
+            tick = self._current_tick
+            if not tick & self._mask:
+                self._cascade(tick) # before advancing, cascaded timers due with this tick belong into its bucket
+            self._current_tick = tick + 1
+            bucket = self._wheel[tick & self._mask]
+            if bucket:
+                try:
+                    fired += self._drain(bucket, now)
+                except BaseException:
+                    self._current_tick = tick # the rest of the bucket is drained with the next tick
+                    raise
+
+        return fired
+
+
+    def run_until(self, deadline: float) -> 'TimingWheel':
+        """Tick the wheel until the time function reaches deadline, sleeping between the ticks."""
+        deadline_ns = _seconds_to_ns(deadline)
+        while self._time_func_ns() < deadline_ns:
+            self.tick()
+            delay = min(self._current_tick * self._resolution_ns, deadline_ns) - self._time_func_ns()
+            if delay > 0:
+                sleep(delay / _NS_PER_SECOND)
+        return self
+
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+    def __repr__(self) -> str:
+        """Return a string representation of the object."""
+        return f"TimingWheel(resolution={self.resolution}, wheel_size={self._wheel_size}, timers={len(self)})"
+
+
+    @property
+    def resolution(self) -> float:
+        """The duration of one wheel slot in seconds (read only)"""
+        return self._resolution_ns / _NS_PER_SECOND
+
+
+class EveryGroup:
+    """A group of Every instances kept in a heap ordered by their next execution time.
+    A single tick() reads the clock once, checking for due timers is O(1) and each execution O(log n).
+    For very many timers (10k+) prefer the TimingWheel.
+    Args:
+        time_func (Callable): The clock shared by all timers of the group (default is monotonic).
+        time_func_ns (Callable): The same clock in integer nanoseconds, used instead of time_func if given.
+    Methods:
+        add(*timers: Every) -> 'EveryGroup': Add one or more Every instances.
+        remove(timer: Every) -> 'EveryGroup': Remove an Every instance from the group.
+        tick() -> int: Execute all due timers, returns the number of executed timers.
+        run_until(deadline: float) -> 'EveryGroup': Tick the group until deadline is reached, sleeping until the next due timer.
+    Note:
+        Each timer is executed at most once per tick, an overdue timer catching up missed executions
+        at most every 1ms. Paused timers are checked for resume() every 10ms.
+        An exception raised by a function is propagated by tick(), the timer stays in the group
+        and the remaining due timers are executed with the next tick().
+        The timers must use the same time function as the group. If you change the interval
+        of a timer outside of its own function, add() it again to update its position.
+    """
+
+    def __init__(self, *, time_func: Callable[[], float] = monotonic,
+                 time_func_ns: Optional[Callable[[], int]] = None) -> None:
+        self._time_func_ns: Callable[[], int] = time_func_ns or _to_ns(time_func)
+        self._heap: list[list] = [] # entries [next_time_ns, sequence, timer or None if removed]
+        self._entries: dict[Every, list] = {}
+        self._stale: int = 0 # removed entries still in the heap
+        self._sequence = count() # tie breaker, timers themselves are not comparable
+
+
+    def _push(self, timer: Every, next_time_ns: int) -> None:
+        entry = [next_time_ns, next(self._sequence), timer]
+        self._entries[timer] = entry
+        heappush(self._heap, entry)
+
+
+    def add(self, *timers: Every) -> 'EveryGroup':
+        """Add one or more Every instances, timers already in the group get their position updated."""
+        for timer in timers:
+            self._discard(timer) # not remove(), subclasses may do more work per call there
+            self._push(timer, timer._start()._next_time_ns)
+        return self
+
+
+    def remove(self, timer: Every) -> 'EveryGroup':
+        """Remove an Every instance from the group, unknown timers are ignored."""
+        self._discard(timer)
+        return self
+
+
+    def _discard(self, timer: Every) -> None:
+        entry = self._entries.pop(timer, None)
+        if entry is not None:
+            entry[-1] = None # removed lazily when it reaches the top of the heap
+            self._stale += 1
+            if self._stale > len(self._entries):
+                self._compact()
+
+
+    def _compact(self) -> None:
+        """Drop all removed entries, e.g. of far future timers that never reach the top of the heap."""
+        self._heap[:] = [entry for entry in self._heap if entry[-1] is not None] # in place, tick() may hold the heap
+        heapify(self._heap)
+        self._stale = 0
+
+
+    def tick(self) -> int:
+        """Execute all due timers with a single read of the clock.
+        Returns:
+            int: The number of executed timers.
+        """
+        now = self._time_func_ns()
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            entry = heappop(heap)
+            timer = entry[-1]
+            if timer is None:
+                self._stale -= 1
+                continue
+
+            if timer._paused:
+                self._push(timer, now + _PAUSED_POLL_NS)
+                continue
+
+            if timer._next_time_ns > now:
+                self._push(timer, timer._next_time_ns)
+                continue
+
+            try:
+                timer._fire()
+                fired += 1
+            finally:
+                if self._entries.get(timer) is entry: # not removed or added again by its own function, also if it raised
+                    # a timer catching up missed executions is not rescheduled in the past
+                    self._push(timer, max(timer._next_time_ns, now + _MIN_DELAY_NS))
+
+        return fired
+
+
+    def run_until(self, deadline: float) -> 'EveryGroup':
+        """Tick the group until the time function reaches deadline, sleeping until the next due timer."""
+        deadline_ns = _seconds_to_ns(deadline)
+        while self._time_func_ns() < deadline_ns:
+            self.tick()
+            wake_up = min(self._heap[0][0], deadline_ns) if self._heap else deadline_ns
+            delay = wake_up - self._time_func_ns()
+            if delay > 0:
+                sleep(delay / _NS_PER_SECOND)
+        return self
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __repr__(self) -> str:
+        """Return a string representation of the object."""
+        return f"EveryGroup(timers={len(self)})"
+
+
+class EveryTimerfdScheduler(EveryGroup):
+    """An EveryGroup backed by a single Linux timerfd, armed to the earliest next execution time.
+    Register fileno() in a selectors or asyncio event loop and call handle_read() when it is readable,
+    the kernel wakes the loop exactly when a timer is due and no polling is needed.
+    All timers must use the default monotonic time function, add() raises a ValueError otherwise.
+    Methods:
+        fileno() -> int: The timerfd file descriptor.
+        handle_read() -> int: Consume the timerfd expiration and execute the due timers.
+        run_until(deadline: float) -> 'EveryTimerfdScheduler': Wait on the timerfd until deadline is reached.
+        close() -> None: Close the timerfd, also done when used as context manager.
+    Example:
+        scheduler = EveryTimerfdScheduler().add(Every(1.0).do(print_hello))
+        asyncio.get_running_loop().add_reader(scheduler.fileno(), scheduler.handle_read)
+    """
+
+    def __init__(self) -> None:
+        if not _LINUX:
+            raise OSError("Error: timerfd is only available on Linux.")
+
+        super().__init__(time_func=monotonic)
+        self._fd: int = _timerfd_create()
+        self._armed_ns: int = 0 # 0 means disarmed
+
+
+    def _arm(self) -> None:
+        """Set the timerfd to the earliest next execution time, only if it changed."""
+        heap = self._heap
+        while heap and heap[0][-1] is None:
+            heappop(heap) # do not wake up for removed timers
+            self._stale -= 1
+        deadline_ns = max(heap[0][0], 1) if heap else 0
+        if deadline_ns != self._armed_ns:
+            _timerfd_settime_ns(self._fd, deadline_ns)
+            self._armed_ns = deadline_ns
+
+
+    def add(self, *timers: Every) -> 'EveryTimerfdScheduler':
+        """Add one or more Every instances and rearm the timerfd once."""
+        for timer in timers:
+            if timer._time_func_ns is not self._time_func_ns:
+                raise ValueError("Error: Timers of a timerfd scheduler must use the monotonic time function.")
+        super().add(*timers)
+        self._arm()
+        return self
+
+
+    def remove(self, timer: Every) -> 'EveryTimerfdScheduler':
+        """Remove an Every instance and rearm the timerfd to the next remaining one."""
+        super().remove(timer)
+        self._arm()
+        return self
+
+
+    def tick(self) -> int:
+        """Execute all due timers and rearm the timerfd to the next one.
+        Returns:
+            int: The number of executed timers.
+        """
+        try:
+            return super().tick()
+        finally:
+            self._arm() # also if a function raised, otherwise the timerfd may stay disarmed
+
+
+    def fileno(self) -> int:
+        """The timerfd file descriptor, readable when a timer is due."""
+        return self._fd
+
+
+    def handle_read(self) -> int:
+        """Consume the timerfd expiration and execute the due timers.
+        Returns:
+            int: The number of executed timers.
+        """
+        try:
+            os.read(self._fd, 8)
+            self._armed_ns = 0 # the expired timerfd is disarmed by the kernel
+        except BlockingIOError:
+            pass # already consumed or rearmed in the meantime
+        return self.tick()
+
+
+    def run_until(self, deadline: float) -> 'EveryTimerfdScheduler':
+        """Wait on the timerfd and execute the due timers until the clock reaches deadline."""
+        deadline_ns = _seconds_to_ns(deadline)
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._fd, selectors.EVENT_READ)
+            self.tick() # execute overdue timers and arm the timerfd
+            while True:
+                timeout = deadline_ns - self._time_func_ns()
+                if timeout <= 0:
+                    break
+                if selector.select(timeout / _NS_PER_SECOND):
+                    self.handle_read()
+        return self
+
+
+    def close(self) -> None:
+        """Close the timerfd."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+    def __enter__(self) -> 'EveryTimerfdScheduler':
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    def __repr__(self) -> str:
+        """Return a string representation of the object."""
+        return f"EveryTimerfdScheduler(fd={self._fd}, timers={len(self)})"
+
+
+class ShardedScheduler:
+    """Distribute many Every instances over several TimingWheels, each ticked by its own thread.
+    Every shard has its own wheel and clock reads, there are no locks shared between the shards.
+    Timers are assigned to the shards round robin and added and removed through a per shard inbox
+    that the shard thread drains before each tick.
+    Args:
+        shards (int): The number of shards and threads (default is the number of CPUs).
+        resolution (float): The duration of one wheel slot in seconds.
+        wheel_size (int): The number of slots per wheel level, must be a power of two.
+        time_func (Callable): The clock shared by all scheduled timers (default is monotonic).
+        time_func_ns (Callable): The same clock in integer nanoseconds, used instead of time_func if given.
+    Methods:
+        add(*timers: Every) -> 'ShardedScheduler': Schedule one or more Every instances.
+        remove(timer: Every) -> 'ShardedScheduler': Remove a scheduled Every instance.
+        start() -> 'ShardedScheduler': Start the shard threads.
+        stop(timeout: float) -> 'ShardedScheduler': Stop the shard threads and wait for them.
+    Note:
+        The functions are executed in the shard threads and have to be thread safe.
+        An exception raised by a function is reported with sys.excepthook and the shard keeps running.
+        Because of the GIL this pays off mostly for functions that release it (I/O, C extensions),
+        each timer always stays in the same shard.
+    """
+
+    def __init__(self, shards: Optional[int] = None, resolution: float = 0.01, wheel_size: int = 256, *,
+                 time_func: Callable[[], float] = monotonic,
+                 time_func_ns: Optional[Callable[[], int]] = None) -> None:
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("Error: Number of shards must be positive.")
+
+        self._wheels: list[TimingWheel] = [TimingWheel(resolution, wheel_size, time_func=time_func, time_func_ns=time_func_ns) for _ in range(shards)]
+        self._inboxes: list[deque] = [deque() for _ in range(shards)] # (add, timer) commands, deque is thread safe
+        self._shard_of: dict[Every, int] = {} # only used by the calling thread
+        self._next_shard = count()
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+
+    def add(self, *timers: Every) -> 'ShardedScheduler':
+        """Schedule one or more Every instances, they are picked up with the next tick of their shard."""
+        for timer in timers:
+            shard = self._shard_of.get(timer)
+            if shard is None:
+                # round robin, object ids are too regular to be spread evenly by a modulo
+                shard = self._shard_of[timer] = next(self._next_shard) % len(self._inboxes)
+            self._inboxes[shard].append((True, timer))
+        return self
+
+
+    def remove(self, timer: Every) -> 'ShardedScheduler':
+        """Remove a scheduled Every instance with the next tick of its shard, unknown timers are ignored."""
+        shard = self._shard_of.pop(timer, None)
+        if shard is not None:
+            self._inboxes[shard].append((False, timer))
+        return self
+
+
+    def _run(self, wheel: TimingWheel, inbox: deque) -> None:
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            while inbox:
+                add, timer = inbox.popleft()
+                if add:
+                    wheel.add(timer)
+                else:
+                    wheel.remove(timer)
+            try:
+                wheel.tick()
+            except Exception:
+                sys.excepthook(*sys.exc_info()) # report it, the wheel goes on with the remaining due timers
+            delay = wheel._current_tick * wheel._resolution_ns - wheel._time_func_ns()
+            if delay > 0:
+                stop_event.wait(delay / _NS_PER_SECOND)
+
+
+    def start(self) -> 'ShardedScheduler':
+        """Start one thread per shard, does nothing if already running."""
+        if not self._threads:
+            self._stop_event.clear()
+            self._threads = [
+                threading.Thread(target=self._run, args=(wheel, inbox), name=f"every-shard-{index}", daemon=True)
+                for index, (wheel, inbox) in enumerate(zip(self._wheels, self._inboxes))
+            ]
+            for thread in self._threads:
+                thread.start()
+        return self
+
+
+    def stop(self, timeout: Optional[float] = None) -> 'ShardedScheduler':
+        """Stop the shard threads and wait up to timeout seconds for each of them."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        return self
+
+
+    def __enter__(self) -> 'ShardedScheduler':
+        return self.start()
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+    def __len__(self) -> int:
+        return sum(len(wheel) for wheel in self._wheels)
+
+
+    def __repr__(self) -> str:
+        """Return a string representation of the object."""
+        return f"ShardedScheduler(shards={len(self._wheels)}, timers={len(self)}, running={bool(self._threads)})"
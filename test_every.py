@@ -0,0 +1,203 @@
+"""
+tests for the Every class of every.py, driven by a fake clock
+Run with: python -m unittest
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+import inspect
+import math
+import unittest
+from time import perf_counter, perf_counter_ns
+from every import Every
+
+MS = 1_000_000 # nanoseconds
+
+
+class FakeClock:
+    """A time function in integer nanoseconds that only moves when advanced."""
+
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, ms: int) -> None:
+        self.now += ms * MS
+
+
+class EveryTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.log = []
+
+
+    def timer(self, interval: float, **options) -> Every:
+        return Every(interval, **options).using_ns(self.clock).do(lambda *args, **kwargs: self.log.append((args, kwargs)))
+
+
+class NanosecondTests(EveryTestCase):
+
+    def test_interval_in_nanoseconds(self) -> None:
+        timer = self.timer(0.1)
+        self.assertEqual(timer._interval_ns, 100 * MS)
+        self.assertEqual(timer.interval, 0.1)
+        timer.interval = 0.3
+        self.assertEqual(timer._interval_ns, 300 * MS) # not 299999999 from float arithmetic
+
+
+    def test_no_drift(self) -> None:
+        timer = self.timer(0.1).reset()
+        for _ in range(1000):
+            self.clock.advance(100)
+            self.assertTrue(timer())
+        self.assertEqual(timer._next_time_ns, self.clock.now + 100 * MS)
+
+
+    def test_infinite_interval(self) -> None:
+        timer = self.timer(math.inf).reset()
+        self.assertEqual(timer.interval, math.inf)
+        self.assertEqual(timer.time_remaining, math.inf)
+        self.assertEqual(timer.remaining_from(0.0), math.inf)
+        self.clock.advance(10 ** 9)
+        self.assertFalse(timer())
+        timer.interval = math.inf
+        self.assertEqual(timer.interval, math.inf)
+
+
+    def test_nan_interval(self) -> None:
+        with self.assertRaisesRegex(ValueError, "^Error: "):
+            Every(math.nan)
+        timer = self.timer(1.0)
+        with self.assertRaisesRegex(ValueError, "^Error: "):
+            timer.interval = math.nan
+
+
+class UsingTests(unittest.TestCase):
+
+    def test_using_ns_keeps_precision(self) -> None:
+        now = [10 ** 18 + 1] # beyond the precision of a float in seconds
+        timer = Every(1e-9).using_ns(lambda: now[0]).do(lambda: None).reset()
+        self.assertEqual(timer._next_time_ns, 10 ** 18 + 2)
+        now[0] += 1
+        self.assertTrue(timer())
+
+
+    def test_using_ns_time_func_in_seconds(self) -> None:
+        timer = Every(1.0).using_ns(lambda: 2_500_000_000)
+        self.assertEqual(timer.time_func(), 2.5)
+
+
+    def test_known_clock_replaced_by_ns_variant(self) -> None:
+        self.assertIs(Every(1.0).using(perf_counter).time_func_ns, perf_counter_ns)
+        self.assertIs(Every(1.0).using_ns(perf_counter_ns).time_func, perf_counter)
+
+
+    def test_using_custom_clock_in_seconds(self) -> None:
+        now = [1.5]
+        timer = Every(0.5).using(lambda: now[0]).do(lambda: None).reset()
+        self.assertEqual(timer._next_time_ns, 2 * 10 ** 9)
+        self.assertEqual(timer.next_time, 2.0)
+
+
+class LazyStartTests(EveryTestCase):
+
+    def test_first_call_starts(self) -> None:
+        timer = self.timer(0.01)
+        self.assertIsNone(timer.next_time)
+        self.clock.advance(100) # created long before the first call
+        self.assertFalse(timer())
+        self.assertEqual(timer._next_time_ns, self.clock.now + 10 * MS)
+        self.clock.advance(9)
+        self.assertFalse(timer())
+        self.clock.advance(1)
+        self.assertTrue(timer())
+
+
+    def test_execute_immediately(self) -> None:
+        timer = self.timer(0.01, execute_immediately=True)
+        self.assertEqual(timer.time_remaining, 0.0)
+        self.clock.advance(100)
+        self.assertTrue(timer())
+        self.assertFalse(timer())
+        self.assertEqual(timer._next_time_ns, self.clock.now + 10 * MS)
+
+
+    def test_not_started_time_remaining(self) -> None:
+        self.assertEqual(self.timer(0.25).time_remaining, 0.25)
+        self.assertEqual(self.timer(0.25).remaining_from(123.0), 0.25)
+
+
+    def test_reset_starts(self) -> None:
+        timer = self.timer(0.01).reset()
+        self.clock.advance(10)
+        self.assertTrue(timer())
+
+
+class AmongTests(EveryTestCase):
+
+    def test_same_keywords_update_in_place(self) -> None:
+        timer = self.timer(0.01).among(name="a", count=1)
+        stored = timer._kwargs
+        timer.among(name="b", count=2)
+        self.assertIs(timer._kwargs, stored)
+        self.assertEqual(dict(timer.kwargs), {"name": "b", "count": 2})
+
+
+    def test_other_keywords_replace(self) -> None:
+        timer = self.timer(0.01).among(name="a", count=1)
+        stored = timer._kwargs
+        timer.among(name="b")
+        self.assertIsNot(timer._kwargs, stored)
+        self.assertEqual(dict(timer.kwargs), {"name": "b"})
+        self.assertEqual(stored, {"name": "a", "count": 1}) # a dict handed out before is not changed
+
+
+    def test_kwargs_read_only(self) -> None:
+        timer = self.timer(0.01).among(name="a")
+        with self.assertRaises(TypeError):
+            timer.kwargs["name"] = "b"
+
+
+    def test_call_overrides_stored_kwargs(self) -> None:
+        timer = self.timer(0.01, execute_immediately=True).among(name="a", count=1)
+        self.assertTrue(timer("x", name="b"))
+        self.assertEqual(self.log, [(("x",), {"name": "b", "count": 1})])
+        self.assertEqual(dict(timer.kwargs), {"name": "a", "count": 1})
+
+
+class DoWhileTests(EveryTestCase):
+
+    def test_loops_until_interval_passed(self) -> None:
+        timer = self.timer(0.01).do(lambda: self.clock.advance(1))
+        timer.do_while()
+        self.assertEqual(self.clock.now, 10 * MS)
+
+
+    def test_negative_min_sleep(self) -> None:
+        timer = self.timer(0.01)
+        with self.assertRaisesRegex(ValueError, "^Error: "):
+            timer.do_while(min_sleep=-0.01)
+        self.assertEqual(self.log, []) # rejected before the first call
+
+
+class SlotsTests(unittest.TestCase):
+
+    def test_signature(self) -> None:
+        parameters = inspect.signature(Every).parameters
+        self.assertEqual(list(parameters), ["interval", "execute_immediately", "keep_interval"])
+
+
+    def test_decorator_keeps_name(self) -> None:
+        @Every.every(1.0)
+        def hello() -> None:
+            pass
+
+        self.assertEqual(hello.__name__, "hello")
+        self.assertFalse(hasattr(Every(1.0), "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
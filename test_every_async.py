@@ -0,0 +1,83 @@
+"""
+tests for the AsyncEvery class of every_async.py, on the real monotonic clock of the event loop
+Run with: python -m unittest
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+import asyncio
+import inspect
+import unittest
+from time import monotonic
+from every_async import AsyncEvery
+
+
+class AsyncEveryTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.times = []
+
+
+    def record(self) -> None:
+        self.times.append(monotonic())
+
+
+    async def run_for(self, timer: AsyncEvery, seconds: float, change=None) -> None:
+        task = timer.start()
+        await asyncio.sleep(0.02)
+        if change:
+            change(timer)
+        await asyncio.sleep(seconds)
+        task.cancel()
+
+
+    def test_signature(self) -> None:
+        inspect.signature(AsyncEvery)
+
+
+    async def test_executes_on_schedule(self) -> None:
+        await self.run_for(AsyncEvery(0.05).do(self.record), 0.2)
+        self.assertIn(len(self.times), (2, 3, 4)) # 4 on time, fewer on a busy machine
+        gaps = [later - earlier for earlier, later in zip(self.times, self.times[1:])]
+        self.assertTrue(all(gap >= 0.045 for gap in gaps), gaps) # never early
+
+
+    async def test_coroutine_function(self) -> None:
+        async def action() -> str:
+            await asyncio.sleep(0)
+            return "done"
+
+        timer = AsyncEvery(0.01, execute_immediately=True).do(action)
+        await self.run_for(timer, 0.01)
+        self.assertEqual(timer.result, "done")
+
+
+    async def test_interval_change_wakes_up(self) -> None:
+        await self.run_for(AsyncEvery(10.0).do(self.record), 0.1, lambda timer: setattr(timer, "interval", 0.02))
+        self.assertGreaterEqual(len(self.times), 2) # not asleep for the old 10s interval
+
+
+    async def test_resume_wakes_up(self) -> None:
+        timer = AsyncEvery(0.01).do(self.record).pause()
+        await self.run_for(timer, 0.05, AsyncEvery.resume)
+        self.assertGreaterEqual(len(self.times), 2)
+
+
+    async def test_paused(self) -> None:
+        await self.run_for(AsyncEvery(0.01).do(self.record).pause(), 0.05)
+        self.assertEqual(self.times, [])
+
+
+    async def test_keep_interval_false_after_coroutine(self) -> None:
+        async def action() -> None:
+            self.record()
+            await asyncio.sleep(0.05)
+
+        await self.run_for(AsyncEvery(0.05, keep_interval=False).do(action), 0.3)
+        gaps = [later - earlier for earlier, later in zip(self.times, self.times[1:])]
+        self.assertTrue(gaps)
+        self.assertTrue(all(gap >= 0.095 for gap in gaps), gaps) # the interval starts when the coroutine finished
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+"""
+tests for the schedulers of every_scheduler.py and every_pool.py, driven by a fake clock
+Run with: python -m unittest
+Author: AlexL
+License: MIT
+Github: https://github.com/Hangover3832/every
+"""
+import math
+import sys
+import threading
+import unittest
+from unittest import mock
+from time import perf_counter
+from every import Every
+from every_scheduler import TimingWheel, EveryGroup, EveryTimerfdScheduler, ShardedScheduler, _MIN_DELAY_NS, _PAUSED_POLL_NS
+
+try:
+    from every_pool import TimerPool
+except ImportError: # numpy is not installed
+    TimerPool = None
+
+MS = 1_000_000 # nanoseconds
+
+
+class FakeClock:
+    """A time function in integer nanoseconds that only moves when advanced."""
+
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, ms: int) -> None:
+        self.now += ms * MS
+
+
+class SchedulerTests:
+    """Tests shared by all single threaded schedulers, make_scheduler() is provided by the subclasses."""
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.scheduler = self.make_scheduler()
+        self.log = []
+
+
+    def timer(self, interval_ms: int, name: str, action=None) -> Every:
+        action = action or (lambda: self.log.append(name))
+        return Every(interval_ms / 1000).using_ns(self.clock).do(action).reset()
+
+
+    def test_executes_due_timers_only(self) -> None:
+        self.scheduler.add(self.timer(10, "a"), self.timer(30, "b"))
+        self.clock.advance(5)
+        self.assertEqual(self.scheduler.tick(), 0)
+        self.clock.advance(5)
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.clock.advance(10)
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.clock.advance(10)
+        self.assertEqual(self.scheduler.tick(), 2)
+        self.assertEqual(sorted(self.log), ["a", "a", "a", "b"])
+
+
+    def test_remove_other_timer_while_executing(self) -> None:
+        other = self.timer(10, "other")
+        self.scheduler.add(self.timer(10, "a", lambda: self.scheduler.remove(other)), other)
+        self.clock.advance(10)
+        self.scheduler.tick()
+        self.assertEqual(len(self.scheduler), 1)
+        self.clock.advance(10)
+        self.scheduler.tick()
+        self.assertEqual(self.log, [])
+
+
+    def test_remove_itself_while_executing(self) -> None:
+        timer = self.timer(10, "a", lambda: self.scheduler.remove(timer))
+        self.scheduler.add(timer)
+        self.clock.advance(10)
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.assertEqual(len(self.scheduler), 0)
+
+
+    def test_add_while_executing(self) -> None:
+        added = self.timer(10, "added")
+        self.scheduler.add(self.timer(10, "a", lambda: self.scheduler.add(added)))
+        self.clock.advance(10)
+        self.scheduler.tick()
+        self.assertEqual(len(self.scheduler), 2)
+        self.clock.advance(10)
+        self.scheduler.tick()
+        self.assertIn("added", self.log)
+
+
+    def test_reset_by_other_timer(self) -> None:
+        other = self.timer(10, "other")
+        timer = self.timer(10, "a", lambda: other.reset())
+        self.scheduler.add(timer, other)
+        self.clock.advance(10)
+        self.scheduler.tick() # depending on the order other may already have been executed
+        self.scheduler.remove(timer)
+        executed = self.log.count("other")
+        self.clock.advance(5)
+        self.scheduler.tick()
+        self.assertEqual(self.log.count("other"), executed)
+        self.clock.advance(5)
+        self.scheduler.tick()
+        self.assertEqual(self.log.count("other"), executed + 1)
+
+
+    def test_pause_resume(self) -> None:
+        timer = self.timer(10, "a")
+        self.scheduler.add(timer)
+        timer.pause()
+        self.clock.advance(50)
+        self.assertEqual(self.scheduler.tick(), 0)
+        timer.resume()
+        self.clock.advance(_PAUSED_POLL_NS // MS)
+        self.assertGreaterEqual(self.scheduler.tick(), 1) # the wheel catches up the missed executions
+        self.assertEqual(len(self.scheduler), 1)
+
+
+    def test_exception_keeps_timer(self) -> None:
+        def fail() -> None:
+            raise RuntimeError("action failed")
+
+        self.scheduler.add(self.timer(10, "failing", fail), self.timer(10, "a"))
+        self.clock.advance(10)
+        with self.assertRaises(RuntimeError):
+            self.scheduler.tick()
+        self.scheduler.tick() # the order of timers due at the same time is not defined
+        self.assertEqual(self.log, ["a"])
+        self.assertEqual(len(self.scheduler), 2)
+        self.clock.advance(10)
+        with self.assertRaises(RuntimeError):
+            self.scheduler.tick() # still scheduled
+
+
+class TimingWheelTests(SchedulerTests, unittest.TestCase):
+
+    def make_scheduler(self) -> TimingWheel:
+        return TimingWheel(0.001, 8, time_func_ns=self.clock)
+
+
+    def test_cascade_from_second_level(self) -> None:
+        self.scheduler.add(self.timer(8, "a"), self.timer(64, "b")) # b is due at a cascading tick
+        for _ in range(64):
+            self.clock.advance(1)
+            self.scheduler.tick()
+        self.assertEqual(self.log.count("a"), 8)
+        self.assertIn("b", self.log) # not a tick late
+
+
+class EveryGroupTests(SchedulerTests, unittest.TestCase):
+
+    def make_scheduler(self) -> EveryGroup:
+        return EveryGroup(time_func_ns=self.clock)
+
+
+    def test_paused_and_overdue_not_rescheduled_in_the_past(self) -> None:
+        paused = self.timer(10, "paused").pause()
+        overdue = self.timer(10, "overdue")
+        self.scheduler.add(paused, overdue)
+        self.clock.advance(50)
+        self.scheduler.tick()
+        now = self.clock.now
+        self.assertEqual(self.scheduler._entries[paused][0], now + _PAUSED_POLL_NS)
+        self.assertEqual(self.scheduler._entries[overdue][0], now + _MIN_DELAY_NS)
+
+
+    def test_removed_entries_are_compacted(self) -> None:
+        never = Every(math.inf).using_ns(self.clock)
+        timer = self.timer(10, "a")
+        for _ in range(1000):
+            self.scheduler.add(never, timer) # e.g. after changing an interval
+        self.assertLessEqual(len(self.scheduler._heap), 2 * len(self.scheduler) + 1)
+        self.clock.advance(10)
+        self.assertEqual(self.scheduler.tick(), 1)
+
+
+@unittest.skipIf(TimerPool is None, "requires numpy")
+class TimerPoolTests(SchedulerTests, unittest.TestCase):
+
+    def make_scheduler(self) -> 'TimerPool':
+        return TimerPool(2, time_func_ns=self.clock)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "requires Linux")
+class EveryTimerfdSchedulerTests(SchedulerTests, unittest.TestCase):
+
+    def make_scheduler(self) -> EveryTimerfdScheduler:
+        scheduler = EveryTimerfdScheduler()
+        scheduler._time_func_ns = self.clock # the timerfd is armed to fake times in the past, that is harmless
+        self.addCleanup(scheduler.close)
+        return scheduler
+
+
+    def test_armed_to_next_timer(self) -> None:
+        first, second = self.timer(10, "a"), self.timer(20, "b")
+        self.scheduler.add(first, second)
+        self.assertEqual(self.scheduler._armed_ns, first._next_time_ns)
+        self.scheduler.remove(first)
+        self.assertEqual(self.scheduler._armed_ns, second._next_time_ns)
+        self.scheduler.remove(second)
+        self.assertEqual(self.scheduler._armed_ns, 0)
+
+
+    def test_armed_once_per_add(self) -> None:
+        timers = [self.timer(10 + index, str(index)) for index in range(10)]
+        with mock.patch("every_scheduler._timerfd_settime_ns") as settime:
+            self.scheduler.add(*timers)
+            self.scheduler.add(*timers) # already in the scheduler
+        self.assertEqual(settime.call_count, 1)
+
+
+    def test_other_clock_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.scheduler.add(Every(0.01).using(perf_counter))
+        self.assertEqual(len(self.scheduler), 0)
+
+
+    def test_paused_timer_not_armed_in_the_past(self) -> None:
+        self.scheduler.add(self.timer(10, "a").pause())
+        self.clock.advance(50)
+        self.scheduler.tick()
+        self.assertEqual(self.scheduler._armed_ns, self.clock.now + _PAUSED_POLL_NS)
+
+
+class ShardedSchedulerTests(unittest.TestCase):
+
+    def test_zero_shards(self) -> None:
+        with self.assertRaises(ValueError):
+            ShardedScheduler(0)
+
+
+    def test_exception_keeps_shard_running(self) -> None:
+        clock = FakeClock()
+        executed = threading.Event()
+        reported = []
+
+        def fail() -> None:
+            executed.set()
+            raise RuntimeError("action failed")
+
+        self.addCleanup(setattr, sys, "excepthook", sys.excepthook)
+        sys.excepthook = lambda *exc_info: reported.append(exc_info[1])
+        with ShardedScheduler(1, 0.001, time_func_ns=clock) as scheduler:
+            scheduler.add(Every(0.01).using_ns(clock).do(fail).reset())
+            for _ in range(2):
+                executed.clear()
+                clock.advance(10)
+                self.assertTrue(executed.wait(5))
+            self.assertTrue(all(thread.is_alive() for thread in scheduler._threads))
+        self.assertGreaterEqual(len(reported), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()